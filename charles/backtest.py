@@ -1,6 +1,6 @@
 \
 import os, sys, pandas as pd, argparse
-from core import load_config, normalize_weights, get_hist_bars, Backtester
+from core import load_config, get_hist_bars, Backtester
 
 def parse_args():
     ap = argparse.ArgumentParser()
@@ -15,7 +15,7 @@ def main():
     symbols = comps + ([cfg.basket.etf] if cfg.basket.etf else [])
     print(f"Fetching bars for: {symbols}")
     px = get_hist_bars(symbols, cfg.data.start, cfg.data.end, cfg.strategy.timeframe, feed=args.feed)
-    weights = normalize_weights(cfg.basket.components)
+    weights = cfg.basket._weights_dict
 
     bt = Backtester(cfg)
     equity = bt.run(px, cfg.basket.etf, weights, cfg.basket.bias, cfg.basket.multiplier)
@@ -1,13 +1,14 @@
 \
 from __future__ import annotations
-import os, time, math, uuid, asyncio, dataclasses, contextlib
-from dataclasses import dataclass
-from typing import Dict, List, Tuple, Optional
+import os, time, math, uuid, asyncio, dataclasses, contextlib, functools
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple, Optional, Union
 import numpy as np
 import pandas as pd
 import yaml
-import pytz
-from datetime import datetime, timezone, timedelta
+from datetime import date, datetime, timezone, timedelta
+from zoneinfo import ZoneInfo
 
 # --- Optional .env loading (safe no-op if the package isn't present) ---
 with contextlib.suppress(Exception):
@@ -21,6 +22,15 @@ ALPACA_SECRET_KEY = os.getenv("ALPACA_SECRET_KEY") or "YOUR_SECRET"
 def get_alpaca_keys() -> Tuple[str, str]:
     return ALPACA_API_KEY, ALPACA_SECRET_KEY
 
+# ---- Optional Numba JIT (no-op decorator if numba isn't installed) ----
+def njit(*args, **kwargs):
+    if len(args) == 1 and callable(args[0]) and not kwargs:
+        return args[0]
+    return lambda f: f
+
+with contextlib.suppress(Exception):
+    from numba import njit  # type: ignore
+
 # ---- Alpaca SDK imports (import-time safe) ----
 with contextlib.suppress(Exception):
     from alpaca.data.requests import StockBarsRequest
@@ -31,6 +41,13 @@ with contextlib.suppress(Exception):
     from alpaca.trading.client import TradingClient
     from alpaca.trading.requests import MarketOrderRequest, LimitOrderRequest, GetOrdersRequest
     from alpaca.trading.enums import OrderSide, TimeInForce, QueryOrderStatus
+    from alpaca.trading.models import Order
+    from alpaca.common.exceptions import APIError
+
+# ---- Optional async HTTP client for concurrent order submission (sync SDK in threads if missing) ----
+httpx = None
+with contextlib.suppress(Exception):
+    import httpx  # type: ignore
 
 # ------------------- Config -------------------
 
@@ -41,6 +58,13 @@ class BasketConfig:
     components: Dict[str, float]
     bias: float = 0.0
     multiplier: float = 1.0
+    # Normalized weights, computed once (the basket doesn't change during a run)
+    _weights_dict: Dict[str, float] = field(init=False, repr=False, compare=False)
+    _weights_arr: np.ndarray = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._weights_dict = normalize_weights(self.components)
+        self._weights_arr = np.array([self._weights_dict[c] for c in self.components], dtype=np.float64)
 
 @dataclass
 class StrategyConfig:
@@ -101,11 +125,67 @@ def normalize_weights(w: Dict[str, float]) -> Dict[str, float]:
     if s == 0: raise ValueError("Weights sum to zero.")
     return {k: float(v) / float(s) for k, v in w.items()}
 
-def synthetic_price(row: pd.Series, weights: Dict[str, float], mult: float = 1.0) -> float:
-    val = 0.0
-    for t, w in weights.items():
-        val += w * float(row[t])
-    return float(mult * val)
+def synthetic_prices(prices: np.ndarray, weights_arr: np.ndarray, mult: float = 1.0) -> np.ndarray:
+    # prices: (n_bars, n_comp) matrix, or a single (n_comp,) row, with columns in weights_arr order
+    return np.asarray(prices, dtype=np.float64) @ weights_arr * mult
+
+def synthetic_price(row: Union[pd.Series, np.ndarray], weights: Union[Dict[str, float], np.ndarray], mult: float = 1.0) -> float:
+    # ndarray rows are taken to be in the same order as the weights
+    if isinstance(row, np.ndarray):
+        w = weights if isinstance(weights, np.ndarray) else np.fromiter(weights.values(), dtype=np.float64, count=len(weights))
+        return float(synthetic_prices(row, w, mult))
+    w = np.fromiter(weights.values(), dtype=np.float64, count=len(weights))
+    return float(synthetic_prices(row[list(weights)].to_numpy(dtype=np.float64), w, mult))
+
+class RollingWindow:
+    # Fixed-length window with O(1) mean/std (ddof=0) from a running sum and sum of squares.
+    # Sums are taken about a shift (re-centred on the window mean once per window length),
+    # which keeps both cancellation in the variance and accumulated drift bounded.
+    def __init__(self, n: int):
+        self.n = n
+        self.buf: deque = deque(maxlen=n)
+        self.shift = 0.0
+        self.sum = 0.0
+        self.sumsq = 0.0
+        self._pushes = 0
+
+    def __len__(self) -> int:
+        return len(self.buf)
+
+    def full(self) -> bool:
+        return len(self.buf) == self.n
+
+    def push(self, x: float):
+        if not self.buf:
+            self.shift = x
+        if self.full():
+            old = self.buf[0] - self.shift
+            self.sum -= old; self.sumsq -= old * old
+        self.buf.append(x)
+        d = x - self.shift
+        self.sum += d; self.sumsq += d * d
+        self._pushes += 1
+        if self._pushes >= self.n:
+            self._resync()
+
+    def replace_last(self, x: float):
+        old = self.buf[-1] - self.shift
+        self.buf[-1] = x
+        d = x - self.shift
+        self.sum += d - old; self.sumsq += d * d - old * old
+
+    def _resync(self):
+        self._pushes = 0
+        self.shift = math.fsum(self.buf) / len(self.buf)
+        self.sum = math.fsum(v - self.shift for v in self.buf)
+        self.sumsq = math.fsum((v - self.shift) ** 2 for v in self.buf)
+
+    def mean(self) -> float:
+        return self.shift + self.sum / len(self.buf)
+
+    def std(self) -> float:
+        m = self.sum / len(self.buf)
+        return math.sqrt(max(self.sumsq / len(self.buf) - m * m, 0.0))
 
 def zscore(x: pd.Series, lookback: int) -> pd.Series:
     mu = x.rolling(lookback, min_periods=lookback//2).mean()
@@ -124,6 +204,18 @@ with contextlib.suppress(Exception):
         "1D": TimeFrame.Day,
     }
 
+# Clients are cached so repeated calls (param sweeps, reconnects) reuse one HTTP session/connection pool
+@functools.lru_cache(maxsize=1)
+def _get_data_client() -> "StockHistoricalDataClient":
+    key, sec = get_alpaca_keys()
+    # raw_data: plain dicts from the API instead of one pydantic model per bar
+    return StockHistoricalDataClient(key, sec, raw_data=True)
+
+@functools.lru_cache(maxsize=2)
+def _get_trading_client(paper: bool) -> "TradingClient":
+    key, sec = get_alpaca_keys()
+    return TradingClient(key, sec, paper=paper)
+
 def get_hist_bars(
     symbols: List[str],
     start: str,
@@ -132,11 +224,14 @@ def get_hist_bars(
     feed: str = "iex",
 ) -> pd.DataFrame:
     \"\"\"Download historical bars from Alpaca (multi-symbol, returns wide df of 'close').\"\"\"
-    key, sec = get_alpaca_keys()
-    client = StockHistoricalDataClient(key, sec)
     req = StockBarsRequest(symbol_or_symbols=symbols, start=start, end=end, timeframe=_TF_MAP[timeframe], feed=DataFeed[feed.upper()])
-    bars = client.get_stock_bars(req).df  # multi-index: (symbol, timestamp)
-    close = bars["close"].unstack(level=0).sort_index()
+    raw = _get_data_client().get_stock_bars(req)  # {symbol: [{"t": ..., "c": ..., ...}, ...]}
+    bars = pd.DataFrame.from_records(
+        [(sym, bar["t"], bar["c"]) for sym, rows in raw.items() for bar in rows],
+        columns=["symbol", "timestamp", "close"],
+    )
+    bars["timestamp"] = pd.to_datetime(bars["timestamp"], utc=True)
+    close = bars.pivot(index="timestamp", columns="symbol", values="close").sort_index()
     close.index.name = "timestamp"
     return close
 
@@ -149,23 +244,9 @@ class Signal:
     action: str     # "LONG_BASKET" | "SHORT_BASKET" | "EXIT" | "NONE"
     target: Dict[str, float]  # target notional per leg (signed)
 
-def make_signal(
-    now_prices: Dict[str, float],
-    hist_spread: pd.Series,
-    cfg: AppConfig,
-) -> Signal:
-    if len(hist_spread) < max(10, cfg.strategy.lookback//2) or hist_spread.std() == 0:
-        return Signal(0.0, 0.0, "NONE", {})
-    roll = cfg.strategy.lookback
-    mu = hist_spread.rolling(roll).mean().iloc[-1]
-    sd = hist_spread.rolling(roll).std(ddof=0).iloc[-1]
-    if sd == 0 or pd.isna(sd) or pd.isna(mu):
-        return Signal(float(hist_spread.iloc[-1]), 0.0, "NONE", {})
-    z = float((hist_spread.iloc[-1] - mu) / sd)
-
+def decide(z: float, cfg: AppConfig, weights: Dict[str, float]) -> Tuple[str, Dict[str, float]]:
     act = "NONE"; targets: Dict[str, float] = {}
     b = cfg.basket; s = cfg.strategy
-    weights = normalize_weights(b.components)
 
     if s.side == "pairs" and b.etf:
         if z > s.entry_z:
@@ -194,88 +275,184 @@ def make_signal(
         elif abs(z) < s.exit_z:
             act = "EXIT"
 
-    return Signal(float(hist_spread.iloc[-1]), z, act, targets)
+    return act, targets
 
-# ------------------- Backtest engine -------------------
+def make_signal(
+    now_prices: Dict[str, float],
+    hist_spread: pd.Series,
+    cfg: AppConfig,
+) -> Signal:
+    if len(hist_spread) < max(10, cfg.strategy.lookback//2) or hist_spread.std() == 0:
+        return Signal(0.0, 0.0, "NONE", {})
+    roll = cfg.strategy.lookback
+    # Only the last window matters; no need to build a full rolling series
+    window = np.asarray(hist_spread.to_numpy()[-roll:], dtype=np.float64)
+    if len(window) < roll:
+        return Signal(float(hist_spread.iloc[-1]), 0.0, "NONE", {})
+    return make_signal_from_stats(float(window[-1]), window.mean(), window.std(), cfg, cfg.basket._weights_dict)
 
-@dataclass
-class Fill:
-    ts: pd.Timestamp
-    symbol: str
-    qty: float
-    px: float
+# Same decision as make_signal, but from window stats the caller already has (e.g. running sums)
+def make_signal_from_stats(
+    last_spread: float,
+    mu: float,
+    sd: float,
+    cfg: AppConfig,
+    weights: Dict[str, float],
+) -> Signal:
+    if sd == 0 or pd.isna(sd) or pd.isna(mu):
+        return Signal(float(last_spread), 0.0, "NONE", {})
+    z = float((last_spread - mu) / sd)
+    act, targets = decide(z, cfg, weights)
+    return Signal(float(last_spread), z, act, targets)
 
-@dataclass
-class Position:
-    qty: float = 0.0
+# ------------------- Backtest engine -------------------
+
+@njit(cache=True)
+def _exec_orders_vec(delta, price, slip_bps):
+    # Signed notional deltas -> (filled qty, fill px) per symbol, slipped against the trade direction
+    side = np.where(delta > 0, 1.0, -1.0)
+    px = price * (1 + side * slip_bps/1e4)
+    qty = np.where(px > 0, np.abs(delta) / px, 0.0) * side
+    return qty, px
+
+@njit(cache=True)
+def _run_bt(prices, spread, mu, sd, weights_vec, etf_idx, min_hist, entry_z, exit_z,
+            max_leg, max_total, side_is_pairs, slip_bps):
+    # prices: (n_bars, n_syms) with components in columns [0, n_comp) and the ETF (if any) at etf_idx.
+    # Returns the equity curve for bars 1..n_bars-1, final qty/cash and the fills as parallel arrays.
+    n_bars, n_syms = prices.shape
+    n_comp = weights_vec.shape[0]
+    if side_is_pairs:
+        trade_idx = np.empty(n_comp + 1, np.int64)
+        trade_idx[0] = etf_idx
+        trade_idx[1:] = np.arange(n_comp)
+    else:
+        trade_idx = np.arange(n_comp)
+    in_trade = np.zeros(n_syms, np.bool_)
+    in_trade[trade_idx] = True
+
+    qty = np.zeros(n_syms)
+    cash = 0.0
+    target = np.zeros(n_syms)
+    equity = np.empty(max(n_bars - 1, 0))
+    cap = 16 * n_syms
+    f_bar = np.empty(cap, np.int64); f_sym = np.empty(cap, np.int64)
+    f_qty = np.empty(cap); f_px = np.empty(cap)
+    nf = 0
+
+    for i in range(1, n_bars):
+        act = 0  # +1 LONG_BASKET, -1 SHORT_BASKET, 2 EXIT
+        if i + 1 >= min_hist and sd[i] > 0 and not np.isnan(mu[i]):
+            z = (spread[i] - mu[i]) / sd[i]
+            if z > entry_z:
+                act = -1
+            elif z < -entry_z:
+                act = 1
+            elif abs(z) < exit_z:
+                act = 2
+
+        if act != 0:
+            if nf + n_syms > cap:
+                f_bar = np.concatenate((f_bar, np.empty_like(f_bar)))
+                f_sym = np.concatenate((f_sym, np.empty_like(f_sym)))
+                f_qty = np.concatenate((f_qty, np.empty_like(f_qty)))
+                f_px = np.concatenate((f_px, np.empty_like(f_px)))
+                cap *= 2
+
+            if act == 2:
+                # Unwind every open position at this bar's price
+                fill_mask = (qty != 0) & ~np.isnan(prices[i])
+                delta = -qty * prices[i]
+            else:
+                target[:] = 0.0
+                if side_is_pairs:
+                    target[etf_idx] = act * max_leg
+                    leftover = max(max_total - max_leg, 0.0)
+                    target[:n_comp] = -act * leftover * weights_vec
+                else:
+                    target[:n_comp] = act * max_leg * weights_vec
+                gross = np.abs(target).sum()
+                scale = min(1.0, max_total / gross) if gross > 0 else 1.0
+                fill_mask = in_trade
+                delta = target * scale
+
+            q, px = _exec_orders_vec(delta, prices[i], slip_bps)
+            q = np.where(fill_mask, q, 0.0)
+            qty += q
+            cash -= np.where(fill_mask, q * px, 0.0).sum()
+            for j in trade_idx:
+                if not fill_mask[j]: continue
+                f_bar[nf] = i; f_sym[nf] = j; f_qty[nf] = q[j]; f_px[nf] = px[j]
+                nf += 1
+
+        # MTM
+        equity[i - 1] = cash + (qty * prices[i]).sum()
+
+    return equity, qty, cash, f_bar[:nf], f_sym[:nf], f_qty[:nf], f_px[:nf]
 
 class Backtester:
     def __init__(self, cfg: AppConfig):
         self.cfg = cfg
-        self.positions: Dict[str, Position] = {}
+        # Positions as structure-of-arrays: qty_arr[sym_to_idx[symbol]]
+        self.sym_to_idx: Dict[str, int] = {}
+        self.qty_arr: np.ndarray = np.zeros(0, dtype=np.float64)
         self.cash: float = 0.0
-        self.fills: List[Fill] = []
-
-    def _price_to_qty(self, notional: float, price: float) -> float:
-        if price <= 0: return 0.0
-        return notional / price
-
-    def _exec_order(self, ts: pd.Timestamp, symbol: str, target_notional_delta: float, price: float, slip_bps: float = 1.0):
-        side = 1 if target_notional_delta > 0 else -1
-        px = price * (1 + side * slip_bps/1e4)
-        qty = self._price_to_qty(abs(target_notional_delta), px) * side
-        self.positions.setdefault(symbol, Position())
-        self.positions[symbol].qty += qty
-        self.cash -= qty * px
-        self.fills.append(Fill(ts, symbol, qty, px))
+        self.fills: pd.DataFrame = pd.DataFrame(columns=["ts", "symbol", "qty", "px"])
 
     def run(self, close_prices: pd.DataFrame, etf: Optional[str], weights: Dict[str, float], bias: float, mult: float) -> pd.DataFrame:
         comp_cols = list(weights.keys())
-        df = close_prices.copy().dropna(axis=0, how="any", subset=(comp_cols + ([etf] if etf else [])))
-        syn = df[comp_cols].apply(lambda row: synthetic_price(row, weights, mult), axis=1)
+        syms = comp_cols + ([etf] if etf else [])
+        n_comp = len(comp_cols)
+        # One float64 price matrix for the run (components first, ETF last); rows are read by index.
+        # Bars with any missing leg are masked out instead of copying and dropna-ing the whole frame.
+        prices_arr = close_prices[syms].to_numpy(dtype=np.float64)
+        valid = ~np.isnan(prices_arr).any(axis=1)
+        if not valid.all():
+            prices_arr = prices_arr[valid]
+        ts_index = close_prices.index[valid]
+
+        # Synthetic basket price as one mat-vec product instead of a per-row apply
+        w_vec = np.array([weights[c] for c in comp_cols], dtype=np.float64)
+        syn = synthetic_prices(prices_arr[:, :n_comp], w_vec, mult)
+        roll = self.cfg.strategy.lookback
         if etf:
-            spread_series = df[etf] - syn - bias
+            spread_arr = prices_arr[:, n_comp] - syn - bias
         else:
-            spread_series = syn - syn.rolling(self.cfg.strategy.lookback).mean()
-
-        equity_curve = []
-        for i in range(1, len(df)):
-            ts = df.index[i]
-            hist_spread = spread_series.iloc[:i+1]
-            now_row = df.iloc[i]
-            now_prices = now_row.to_dict()
-
-            sig = make_signal(now_prices, hist_spread, self.cfg)
-
-            if sig.action in ("LONG_BASKET", "SHORT_BASKET"):
-                gross = sum(abs(v) for v in sig.target.values())
-                scale = min(1.0, self.cfg.strategy.max_total_notional / gross) if gross > 0 else 1.0
-                for sym, ntl in sig.target.items():
-                    px = now_prices[sym]
-                    self._exec_order(ts, sym, ntl*scale, px, slip_bps=1.0)
-            elif sig.action == "EXIT":
-                for sym, pos in list(self.positions.items()):
-                    px = now_prices.get(sym, np.nan)
-                    if np.isnan(px) or pos.qty == 0: continue
-                    self._exec_order(ts, sym, -pos.qty*px, px, slip_bps=1.0)
-
-            # MTM
-            eq = self.cash
-            for sym, pos in self.positions.items():
-                px = now_prices.get(sym, np.nan)
-                if not np.isnan(px):
-                    eq += pos.qty * px
-            equity_curve.append((ts, eq))
-
-        return pd.DataFrame(equity_curve, columns=["timestamp", "equity"]).set_index("timestamp")
+            spread_arr = syn - pd.Series(syn).rolling(roll).mean().to_numpy()
+
+        # Rolling stats computed once for the whole series; the kernel only indexes into them
+        spread = pd.Series(spread_arr)
+        mu = spread.rolling(roll).mean().to_numpy()
+        sd = spread.rolling(roll).std(ddof=0).to_numpy()
+        sig_weights = self.cfg.basket._weights_dict
+        sig_vec = np.array([sig_weights[c] for c in comp_cols], dtype=np.float64)
+
+        s = self.cfg.strategy
+        equity, qty, cash, f_bar, f_sym, f_qty, f_px = _run_bt(
+            prices_arr, spread_arr, mu, sd, sig_vec,
+            n_comp if etf else -1, max(10, roll//2), float(s.entry_z), float(s.exit_z),
+            float(s.max_leg_notional), float(s.max_total_notional),
+            s.side == "pairs" and etf is not None, 1.0,
+        )
+
+        self.sym_to_idx = {sym: j for j, sym in enumerate(syms)}
+        self.qty_arr = qty
+        self.cash = float(cash)
+        self.fills = pd.DataFrame({"ts": ts_index[f_bar], "symbol": np.asarray(syms, dtype=object)[f_sym], "qty": f_qty, "px": f_px})
+
+        return pd.DataFrame({"equity": equity}, index=ts_index[1:].rename("timestamp"))
 
 # ------------------- Alpaca broker helpers -------------------
 
 class AlpacaBroker:
     \"\"\"Wrapper for notional (market) and qty (limit) orders, positions, account equity, and order mgmt.\"\"\"
+    _REST_URL = {True: "https://paper-api.alpaca.markets", False: "https://api.alpaca.markets"}
+    _RETRY_STATUS = (429, 504)  # same codes alpaca-py retries on; the async path retries once
+
     def __init__(self, paper: bool = True):
-        key, sec = get_alpaca_keys()
-        self.trading = TradingClient(key, sec, paper=paper)
+        self.trading = _get_trading_client(paper)
+        self.paper = paper
+        self._http = None  # shared httpx.AsyncClient, created on first async order
 
     def _tif(self, tif: str) -> TimeInForce:
         return getattr(TimeInForce, tif.upper())
@@ -297,6 +474,60 @@ class AlpacaBroker:
         req = LimitOrderRequest(symbol=symbol, qty=qty, side=side_enum, time_in_force=self._tif(tif), limit_price=float(limit_price))
         return self.trading.submit_order(req, client_order_id=client_order_id)
 
+    # ---- Async REST path (alpaca-py is sync-only) so order legs can be sent concurrently;
+    #      returns the same Order / raises the same APIError as the sync methods ----
+    def _http_client(self):
+        if self._http is None:
+            key, sec = get_alpaca_keys()
+            self._http = httpx.AsyncClient(
+                base_url=self._REST_URL[self.paper],
+                headers={"APCA-API-KEY-ID": key, "APCA-API-SECRET-KEY": sec},
+                timeout=10.0,
+            )
+        return self._http
+
+    async def _post_order(self, payload: Dict[str, object]) -> Order:
+        # Mirrors the SDK: Order on success, APIError carrying Alpaca's JSON body on rejection.
+        # The resend reuses payload's client_order_id, so Alpaca refuses it if the first one landed.
+        resp = await self._http_client().post("/v2/orders", json=payload)
+        if resp.status_code in self._RETRY_STATUS:
+            await asyncio.sleep(3)
+            resp = await self._http_client().post("/v2/orders", json=payload)
+        if resp.is_error:
+            raise APIError(resp.text, httpx.HTTPStatusError(f"{resp.status_code} {resp.reason_phrase}", request=resp.request, response=resp))
+        return Order(**resp.json())
+
+    async def submit_notional_market_async(self, symbol: str, side: str, notional: float, tif: str, cid_prefix: str) -> Order:
+        if httpx is None:
+            return await asyncio.to_thread(self.submit_notional_market, symbol, side, notional, tif, cid_prefix)
+        return await self._post_order({
+            "symbol": symbol,
+            "notional": str(abs(float(notional))),
+            "side": "buy" if side.lower()=="buy" else "sell",
+            "type": "market",
+            "time_in_force": tif.lower(),
+            "client_order_id": f"{cid_prefix}-{symbol}-{uuid.uuid4().hex[:8]}",
+        })
+
+    async def submit_limit_qty_async(self, symbol: str, side: str, notional: float, limit_price: float, tif: str, cid_prefix: str) -> Order:
+        if httpx is None:
+            return await asyncio.to_thread(self.submit_limit_qty, symbol, side, notional, limit_price, tif, cid_prefix)
+        qty = max(int(abs(float(notional)) / float(limit_price)), 1)
+        return await self._post_order({
+            "symbol": symbol,
+            "qty": str(qty),
+            "side": "buy" if side.lower()=="buy" else "sell",
+            "type": "limit",
+            "time_in_force": tif.lower(),
+            "limit_price": str(float(limit_price)),
+            "client_order_id": f"{cid_prefix}-{symbol}-{uuid.uuid4().hex[:8]}",
+        })
+
+    async def aclose(self):
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
     def cancel_all_open(self):
         self.trading.cancel_orders()
 
@@ -319,14 +550,29 @@ class AlpacaBroker:
             return float(acct.cash)
 
 # ------------------- Trading-time helpers -------------------
-NY = pytz.timezone("America/New_York")
+NY = ZoneInfo("America/New_York")
+
+# RTH session per UTC date as (start, end) UTC epoch seconds, or None on weekends.
+# 09:30-16:00 ET always falls inside a single UTC date, so the UTC date is a safe key.
+_RTH_UTC: Dict[date, Optional[Tuple[float, float]]] = {}
+
+def _rth_bounds_utc(day: date) -> Optional[Tuple[float, float]]:
+    if day.weekday() >= 5:  # Sat/Sun
+        return None
+    start = datetime(day.year, day.month, day.day, 9, 30, tzinfo=NY).timestamp()
+    end   = datetime(day.year, day.month, day.day, 16, 0, tzinfo=NY).timestamp()
+    return start, end
 
 def is_rth(dt_utc: datetime) -> bool:
     if dt_utc.tzinfo is None:
         dt_utc = dt_utc.replace(tzinfo=timezone.utc)
-    dt_ny = dt_utc.astimezone(NY)
-    if dt_ny.weekday() >= 5:  # Sat/Sun
+    elif dt_utc.utcoffset():
+        dt_utc = dt_utc.astimezone(timezone.utc)
+    day = dt_utc.date()
+    try:
+        bounds = _RTH_UTC[day]
+    except KeyError:
+        bounds = _RTH_UTC[day] = _rth_bounds_utc(day)
+    if bounds is None:
         return False
-    start = dt_ny.replace(hour=9, minute=30, second=0, microsecond=0)
-    end   = dt_ny.replace(hour=16, minute=0,  second=0, microsecond=0)
-    return start <= dt_ny <= end
+    return bounds[0] <= dt_utc.timestamp() <= bounds[1]
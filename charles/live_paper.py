@@ -1,8 +1,8 @@
 \
-import os, sys, asyncio, numpy as np, pandas as pd, time
+import os, sys, asyncio, numpy as np, time
 from datetime import datetime, timezone
 import argparse
-from core import load_config, normalize_weights, synthetic_price, AlpacaBroker, is_rth, get_alpaca_keys
+from core import load_config, synthetic_prices, make_signal_from_stats, RollingWindow, AlpacaBroker, is_rth, get_alpaca_keys
 from core import StockDataStream
 
 def bps(x): return x/1e4
@@ -14,7 +14,9 @@ def parse_args():
     return ap.parse_args()
 
 async def run_once(cfg):
-    weights = normalize_weights(cfg.basket.components)
+    weights = cfg.basket._weights_dict
+    comp_cols = list(weights.keys())
+    w_vec = cfg.basket._weights_arr
     universe = list(weights.keys()) + ([cfg.basket.etf] if cfg.basket.etf else [])
     print("Universe:", universe)
 
@@ -22,8 +24,15 @@ async def run_once(cfg):
     stream = StockDataStream(key, sec)
     broker = AlpacaBroker(paper=True)
 
-    closes = {sym: [] for sym in universe}
     last_px = {sym: None for sym in universe}
+    # Latest price snapshot as a vector in universe order (components first, ETF last)
+    px_vec = np.full(len(universe), np.nan)
+    sym_idx = {sym: j for j, sym in enumerate(universe)}
+    n_comp = len(comp_cols)
+    # One spread sample per bar timestamp; mean/std maintained incrementally
+    syn_win = RollingWindow(cfg.strategy.lookback)
+    spread_win = RollingWindow(cfg.strategy.lookback)
+    sample_ts = None
     initial_equity = broker.get_account_equity()
     max_equity = initial_equity
     print(f"Account equity baseline: {initial_equity:.2f}")
@@ -40,8 +49,13 @@ async def run_once(cfg):
         except Exception as e:
             print("cancel_all_open error:", e)
 
+    def sample(win, x, new_bar):
+        # Later legs of the same bar refresh that bar's sample instead of adding a new one
+        if new_bar or not len(win): win.push(x)
+        else: win.replace_last(x)
+
     async def on_bar(bar):
-        nonlocal max_equity
+        nonlocal max_equity, sample_ts
         # Guard: regular hours only
         ts = getattr(bar, "timestamp", None)
         if ts is None:
@@ -52,27 +66,31 @@ async def run_once(cfg):
         sym = bar.symbol
         px = float(bar.close)
         last_px[sym] = px
-        closes[sym].append(px)
-        if len(closes[sym]) > max(2000, cfg.strategy.lookback*5):
-            closes[sym] = closes[sym][-cfg.strategy.lookback*5:]
+        px_vec[sym_idx[sym]] = px
 
-        # Need enough history for all symbols
-        if not all(len(closes[s]) >= cfg.strategy.lookback for s in universe):
+        # Need a price for every symbol before the basket can be priced
+        if np.isnan(px_vec).any():
             return
 
-        df = pd.DataFrame({s: closes[s][-cfg.strategy.lookback*2:] for s in universe})
-        syn = df[[c for c in weights]].apply(lambda row: sum(weights[t]*row[t] for t in weights), axis=1) * cfg.basket.multiplier
+        new_bar = ts != sample_ts
+        sample_ts = ts
+
+        syn = float(synthetic_prices(px_vec[:n_comp], w_vec, cfg.basket.multiplier))
         if cfg.basket.etf:
-            spread = df[cfg.basket.etf] - syn - cfg.basket.bias
+            spread = float(px_vec[n_comp]) - syn - cfg.basket.bias
         else:
-            spread = syn - syn.rolling(cfg.strategy.lookback).mean()
-
-        if len(spread) < cfg.strategy.lookback: return
-        mu = spread.rolling(cfg.strategy.lookback).mean().iloc[-1]
-        sd = spread.rolling(cfg.strategy.lookback).std(ddof=0).iloc[-1]
+            sample(syn_win, syn, new_bar)
+            if not syn_win.full(): return
+            spread = syn - syn_win.mean()
+        sample(spread_win, spread, new_bar)
+
+        if not spread_win.full(): return
+        mu = spread_win.mean()
+        sd = spread_win.std()
         if sd == 0 or np.isnan(sd): return
-        z = float((spread.iloc[-1] - mu)/sd)
-        print(f"[{datetime.now().isoformat(timespec='seconds')}] z={z:.2f} spread={spread.iloc[-1]:.4f}")
+        sig = make_signal_from_stats(spread, mu, sd, cfg, weights)
+        z = sig.z
+        print(f"[{datetime.now().isoformat(timespec='seconds')}] z={z:.2f} spread={sig.spread:.4f}")
 
         # Kill switch using live equity
         try:
@@ -98,13 +116,7 @@ async def run_once(cfg):
             print("Equity check error:", e)
 
         # Decide action
-        act = None
-        if z > cfg.strategy.entry_z:
-            act = "SHORT"
-        elif z < -cfg.strategy.entry_z:
-            act = "LONG"
-        elif abs(z) < cfg.strategy.exit_z:
-            act = "EXIT"
+        act = {"SHORT_BASKET": "SHORT", "LONG_BASKET": "LONG", "EXIT": "EXIT"}.get(sig.action)
 
         if act is None: return
         group_id = f"basket-{int(time.time())}"
@@ -133,17 +145,21 @@ async def run_once(cfg):
                     leg_orders.append(("limit_qty", t, side, ntl, lim))
 
             # Basic exposure cap: skip legs exceeding per-symbol cap
+            tasks, task_syms = [], []
             for typ, sym, side, ntl, lim in leg_orders:
                 if ntl > cfg.risk.max_symbol_notional: 
                     print(f"Skip {sym}: leg notional {ntl} > cap {cfg.risk.max_symbol_notional}")
                     continue
-                try:
-                    if typ == "market_notional":
-                        broker.submit_notional_market(symbol=sym, side=side, notional=ntl, tif=cfg.strategy.tif, cid_prefix=group_id)
-                    else:
-                        broker.submit_limit_qty(symbol=sym, side=side, notional=ntl, limit_price=lim, tif=cfg.strategy.tif, cid_prefix=group_id)
-                except Exception as e:
-                    print("Order error:", sym, e)
+                if typ == "market_notional":
+                    tasks.append(broker.submit_notional_market_async(symbol=sym, side=side, notional=ntl, tif=cfg.strategy.tif, cid_prefix=group_id))
+                else:
+                    tasks.append(broker.submit_limit_qty_async(symbol=sym, side=side, notional=ntl, limit_price=lim, tif=cfg.strategy.tif, cid_prefix=group_id))
+                task_syms.append(sym)
+
+            # All legs in flight at once: entry latency is one round trip, not one per leg
+            for sym, res in zip(task_syms, await asyncio.gather(*tasks, return_exceptions=True)):
+                if isinstance(res, Exception):
+                    print("Order error:", sym, res)
 
             # Cancel any leftovers after a short delay (stale IOC/limits)
             asyncio.create_task(cancel_open_after(cfg.risk.cancel_after_sec))
@@ -152,16 +168,18 @@ async def run_once(cfg):
             # Flatten live positions for all symbols in universe with qty
             try:
                 pos = broker.get_positions()
+                tasks, task_syms = [], []
                 for sym in universe:
                     qty = pos.get(sym, 0.0)
                     if abs(qty) < 1e-6: continue
                     side = "sell" if qty > 0 else "buy"
                     last = last_px[sym]
                     lim = None if cfg.strategy.order_type.lower()=="market" else (last * (1 - bps(cfg.strategy.limit_slip_bps)) if side=="buy" else last * (1 + bps(cfg.strategy.limit_slip_bps)))
-                    try:
-                        broker.submit_limit_qty(symbol=sym, side=side, notional=abs(qty)*last, limit_price=(lim or last), tif=cfg.strategy.tif, cid_prefix=f"{group_id}-exit")
-                    except Exception as e:
-                        print("Exit order error:", sym, e)
+                    tasks.append(broker.submit_limit_qty_async(symbol=sym, side=side, notional=abs(qty)*last, limit_price=(lim or last), tif=cfg.strategy.tif, cid_prefix=f"{group_id}-exit"))
+                    task_syms.append(sym)
+                for sym, res in zip(task_syms, await asyncio.gather(*tasks, return_exceptions=True)):
+                    if isinstance(res, Exception):
+                        print("Exit order error:", sym, res)
             except Exception as e:
                 print("Exit error:", e)
 
@@ -169,7 +187,10 @@ async def run_once(cfg):
     for s in universe:
         stream.subscribe_bars(on_bar, s)
 
-    await stream.run()
+    try:
+        await stream.run()
+    finally:
+        await broker.aclose()
 
 async def main():
     args = parse_args()
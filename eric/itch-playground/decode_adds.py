@@ -4,12 +4,30 @@
 import sys
 import os
 import re
+import mmap
+import struct
+import itertools
 
-def be_uint(b):
-    v = 0
-    for x in b:
-        v = (v << 8) | x
-    return v
+try:  # optional: whole-buffer decode (see _scan_vectorized); falls back to the per-record loop
+    import numpy as np
+    import pandas as pd
+except ImportError:
+    np = pd = None
+
+# ITCH 5.0 framing: every message is preceded by a big-endian uint16 length
+_LEN = struct.Struct('>H')
+# Add Order body after the 'A' type byte:
+#   2 (stockLocate) + 2 (tracking) + 6 (timestamp) + 8 (orderRef) + 1 (side) + 4 (shares) + 8 (stock) + 4 (price)
+_ADD = struct.Struct('>HH6sQcI8sI')
+# the same Add Order record (type byte included) as a NumPy structured dtype; the 48-bit
+# timestamp is split into a uint16 high part and uint32 low part
+ADD_DTYPE = None if np is None else np.dtype([
+    ('mtype', 'S1'), ('stock_loc', '>u2'), ('track', '>u2'), ('ts_hi', '>u2'), ('ts_lo', '>u4'),
+    ('order_ref', '>u8'), ('side', 'S1'), ('shares', '>u4'), ('stock', 'S8'), ('price', '>u4'),
+])
+
+_OUT_FLUSH_BYTES = 1 << 20
+_VEC_BATCH_ROWS = 1 << 16  # Add records decoded per batch in _scan_vectorized
 
 def csv_escape(s):
     s = str(s)
@@ -17,24 +35,33 @@ def csv_escape(s):
         s = '"' + s.replace('"', '""') + '"'
     return s
 
+# stock symbol sanitization as byte tables (runs in C on the raw 8-byte field):
+# keep alphanum, dot, dash, space; lowercase is uppercased; everything else is dropped
+_SYM_KEEP = set(b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789.- ')
+_SYM_UPPER = bytes(c - 32 if 97 <= c <= 122 else c for c in range(256))
+_SYM_DELETE = bytes(c for c in range(256) if c not in _SYM_KEEP)
+_SYM_WS = b' \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f'  # what str.strip() removes within ASCII
+
+def normalize_symbol(raw):
+    # NULs removed, edges stripped, then filtered/uppercased
+    return raw.translate(None, b'\x00').strip(_SYM_WS).translate(_SYM_UPPER, _SYM_DELETE).decode('ascii')
+
+def format_price(price_int):
+    # price scaling: many ITCH feeds use price in 1/10000 ($ = price/10000). adjust scale if needed.
+    # Prices stay integers until output; integer division avoids a float round-trip per record.
+    return f"{price_int // 10000}.{price_int % 10000:04d}"
+
 def decode_add_at(buf, pos):
     # pos points at the 'A' byte
     # layout: 1 (type) + 2 (stockLocate) + 2 (tracking) + 6 (timestamp)
     #         + 8 (orderRef) + 1 (side) + 4 (shares) + 8 (stock) + 4 (price)
-    header_len = 1 + 2 + 2 + 6
-    payload_len = 8 + 1 + 4 + 8 + 4
-    need = header_len + payload_len
-    if pos + need > len(buf):
+    if pos + 1 + _ADD.size > len(buf):
         return None
-    cur = pos + 1
-    stock_loc = be_uint(buf[cur:cur+2]); cur += 2
-    track_num = be_uint(buf[cur:cur+2]); cur += 2
-    ts48 = be_uint(buf[cur:cur+6]); cur += 6  # nanoseconds since midnight (48-bit)
-    order_ref = be_uint(buf[cur:cur+8]); cur += 8
-    side = chr(buf[cur]) if buf[cur] >= 32 and buf[cur] <= 126 else '?'; cur += 1
-    shares = be_uint(buf[cur:cur+4]); cur += 4
-    stock = buf[cur:cur+8].decode('ascii', errors='replace').rstrip('\x00').rstrip(); cur += 8
-    price_int = be_uint(buf[cur:cur+4]); cur += 4
+    stock_loc, track_num, ts_bytes, order_ref, side_b, shares, stock_b, price_int = _ADD.unpack_from(buf, pos + 1)
+    cur = pos + 1 + _ADD.size
+    ts48 = int.from_bytes(ts_bytes, 'big')  # nanoseconds since midnight (48-bit)
+    side = chr(side_b[0]) if 32 <= side_b[0] <= 126 else '?'
+    stock = normalize_symbol(stock_b)
     # Convert timestamp (48-bit ns) to human time (assume date unknown => show hh:mm:ss.ssssss)
     seconds = ts48 // 1_000_000_000
     ns_rem = ts48 % 1_000_000_000
@@ -42,8 +69,6 @@ def decode_add_at(buf, pos):
     mm = (seconds % 3600) // 60
     ss = seconds % 60
     ts_human = f"{hh:02d}:{mm:02d}:{ss:02d}.{ns_rem:09d}"
-    # price scaling: many ITCH feeds use price in 1/10000 ($ = price/10000). adjust scale if needed.
-    price = price_int / 10000.0
     return {
         'ts48': ts48,
         'ts_human': ts_human,
@@ -53,60 +78,146 @@ def decode_add_at(buf, pos):
         'side': side,
         'shares': shares,
         'stock': stock,
-        'price_int': price_int,
-        'price': price,
+        'price_int': price_int,  # fixed point, 1/10000 $ (see format_price)
         'next_pos': cur
     }
 
-def scan_file(path, max_rows=2000):
-    with open(path, 'rb') as f:
-        buf = f.read()
+def add_offsets(buf):
+    # walk the length framing and yield the position of each 'A' Add Order type byte;
+    # only real message type bytes are looked at, never payload bytes, so there is no
+    # pattern search (and no false-positive 0x41 hits) at all: one O(n) pass over headers
     i = 0
-    found = 0
     n = len(buf)
+    while i + _LEN.size < n:
+        (msg_len,) = _LEN.unpack_from(buf, i)
+        pos = i + _LEN.size
+        i = pos + msg_len
+        if i > n:  # truncated trailing message (e.g. a partial download)
+            break
+        if buf[pos] == 0x41 and msg_len >= 1 + _ADD.size:
+            yield pos
+
+def date_prefix_for(path):
     # try to infer date from filename (MMDDYYYY) to form full timestamps
     basename = os.path.basename(path)
-    date_prefix = None
     m = re.match(r"(\d{8})", basename)
-    if m:
-        s = m.group(1)
-        # assume MMDDYYYY
-        try:
-            mm = int(s[0:2]); dd = int(s[2:4]); yyyy = int(s[4:8])
-            date_prefix = f"{yyyy:04d}-{mm:02d}-{dd:02d}T"
-        except Exception:
-            date_prefix = None
-
-    # print CSV header
-    print('timestamp,order_ref,side,shares,price,stock')
-
-    while i < n:
-        try:
-            pos = buf.index(b'A', i)
-        except ValueError:
-            break
+    if not m:
+        return None
+    s = m.group(1)
+    # assume MMDDYYYY
+    try:
+        mm = int(s[0:2]); dd = int(s[2:4]); yyyy = int(s[4:8])
+        return f"{yyyy:04d}-{mm:02d}-{dd:02d}T"
+    except Exception:
+        return None
+
+def scan_file(path, max_rows=2000):
+    # memory-map rather than read: full-day files are several GB
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            buf = b''
+        else:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if np is not None and pd is not None:
+        _scan_vectorized(buf, path, max_rows)
+    else:
+        _scan(buf, path, max_rows)
+    # Closed on success only: on error the traceback still holds NumPy views of the map, and
+    # close() would raise BufferError over the real exception. The map is then freed with them.
+    if isinstance(buf, mmap.mmap):
+        buf.close()
+
+def _scan(buf, path, max_rows):
+    found = 0
+    date_prefix = date_prefix_for(path)
+
+    # rows are batched into one bytearray and written to the binary stdout once it passes ~1 MB
+    out = sys.stdout.buffer
+    out_buf = bytearray(b'timestamp,order_ref,side,shares,price,stock\n')
+    sys.stdout.flush()
+
+    for pos in add_offsets(buf):
         decoded = decode_add_at(buf, pos)
         if decoded:
-            # sanitize stock symbol: keep printable alphanum, dot, dash, space
-            stock = decoded['stock']
-            stock = stock.replace("\x00", "").strip()
-            stock = re.sub(r"[^A-Z0-9.\- ]", "", stock.upper())
-
             # attach date if available
             ts = decoded['ts_human']
             if date_prefix:
                 ts = date_prefix + ts
 
-            # CSV-safe print: escape fields
-            out = [ts, str(decoded['order_ref']), decoded['side'], str(decoded['shares']), f"{decoded['price']:.4f}", stock]
-            out = [csv_escape(x) for x in out]
-            print(','.join(out))
+            # CSV-safe: only side can hold a delimiter/quote (any printable byte); the other
+            # fields are digits, the timestamp, or the already-sanitized symbol
+            out_buf += f"{ts},{decoded['order_ref']},{csv_escape(decoded['side'])},{decoded['shares']},{format_price(decoded['price_int'])},{decoded['stock']}\n".encode('ascii')
+            if len(out_buf) >= _OUT_FLUSH_BYTES:
+                out.write(out_buf)
+                out_buf.clear()
             found += 1
             if found >= max_rows:
                 break
-            i = decoded['next_pos']
-        else:
-            i = pos + 1
+
+    out.write(out_buf)
+    out.flush()
+
+def _digit_cols(v, width):
+    # zero-padded decimal digits of non-negative ints as a (n, width) block of ASCII bytes
+    pow10 = 10 ** np.arange(width - 1, -1, -1, dtype=np.int64)
+    return ((v[:, None] // pow10) % 10 + 48).astype(np.uint8)
+
+def _text_cols(n, *parts):
+    # glue literal strings and _digit_cols blocks side by side into one fixed-width text column
+    cols = [np.broadcast_to(np.frombuffer(p.encode('ascii'), dtype=np.uint8), (n, len(p))) if isinstance(p, str) else p
+            for p in parts]
+    block = np.ascontiguousarray(np.concatenate(cols, axis=1))
+    return block.view(f'S{block.shape[1]}').ravel().astype(f'U{block.shape[1]}')
+
+def _scan_vectorized(buf, path, max_rows):
+    # Same output as _scan, but Add records are decoded a batch at a time as NumPy structured
+    # arrays; each batch is written out before the next is taken, so memory is bounded by
+    # _VEC_BATCH_ROWS rather than max_rows
+    raw = np.frombuffer(buf, dtype=np.uint8) if len(buf) else np.zeros(0, dtype=np.uint8)
+    date_prefix = date_prefix_for(path) or ''
+    offsets = add_offsets(buf)
+    remaining = max(max_rows, 1)
+    out = sys.stdout.buffer
+    sys.stdout.flush()
+    out.write(b'timestamp,order_ref,side,shares,price,stock\n')
+    while remaining > 0:
+        offs = np.fromiter(itertools.islice(offsets, min(remaining, _VEC_BATCH_ROWS)), dtype=np.int64)
+        if not len(offs):
+            break
+        remaining -= len(offs)
+        _decode_batch(raw, offs, date_prefix).to_csv(out, index=False, header=False, lineterminator='\n', encoding='ascii')
+    out.flush()
+
+def _decode_batch(raw, offs, date_prefix):
+    recs = raw[offs[:, None] + np.arange(ADD_DTYPE.itemsize)].view(ADD_DTYPE).ravel()
+
+    # Convert timestamp (48-bit ns) to human time, same layout as decode_add_at
+    ts48 = (recs['ts_hi'].astype(np.int64) << 32) | recs['ts_lo'].astype(np.int64)
+    seconds, ns_rem = np.divmod(ts48, 1_000_000_000)
+    hh = seconds // 3600
+    mm = (seconds % 3600) // 60
+    ss = seconds % 60
+    ts = _text_cols(len(recs), date_prefix, _digit_cols(hh, 2), ':', _digit_cols(mm, 2), ':',
+                    _digit_cols(ss, 2), '.', _digit_cols(ns_rem, 9))
+
+    side_b = recs['side'].view(np.uint8)
+    side = np.where((side_b >= 32) & (side_b <= 126), side_b, ord('?')).astype(np.uint8).view('S1').astype('U1')
+    # sanitize stock symbol once per distinct raw field (a day has a few thousand), then scatter back
+    uniq, inv = np.unique(recs['stock'], return_inverse=True)
+    stock = np.array([normalize_symbol(u) for u in uniq], dtype=object)[inv.ravel()]
+
+    # fixed-point price (1/10000 $) formatted with integer ops only, as in format_price
+    price_int = recs['price'].astype(np.int64)
+    price = np.char.add((price_int // 10000).astype(str), _text_cols(len(recs), '.', _digit_cols(price_int % 10000, 4)))
+
+    return pd.DataFrame({
+        'timestamp': ts,
+        'order_ref': recs['order_ref'].astype(np.uint64),
+        'side': side,
+        'shares': recs['shares'].astype(np.int64),
+        'price': price,
+        'stock': stock,
+    })
 
 if __name__ == '__main__':
     if len(sys.argv) < 2: